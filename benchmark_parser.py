@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Benchmark the Canterbury Bins response parser on synthetic responses."""
+import argparse
+import timeit
+
+from script_support import load_parser, make_response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--events",
+        type=int,
+        nargs="+",
+        default=[0, 100, 1000, 5000],
+        help="streetStatus event counts to benchmark",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats")
+    args = parser.parse_args()
+
+    response_parser = load_parser()
+    backend = "orjson" if response_parser.orjson is not None else "json"
+    print(f"JSON backend: {backend}")
+    print(f"{'events':>8} {'bytes':>10} {'per parse':>12} {'parses/s':>10}")
+
+    for events in args.events:
+        response = make_response(events)
+        size = len(response["dates"]) + len(response["status"])
+        timer = timeit.Timer(lambda: response_parser.parse_response(response))
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=args.repeat, number=number)) / number
+        print(f"{events:>8} {size:>10} {best * 1e6:>10.1f}us {1 / best:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Look up bin collections for many properties concurrently.
+
+Reads UPRN/USRN pairs from CSV or JSONL files (or stdin) and writes one NDJSON
+result per property as lookups complete, followed by a summary on stderr.
+"""
+import argparse
+import asyncio
+import csv
+import importlib
+import json
+import random
+import sys
+import time
+from datetime import date
+
+import aiohttp
+
+from script_support import load_parser
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class InputError:
+    """An input line that does not hold a UPRN/USRN pair."""
+
+    def __init__(self, source, reason):
+        self.source = source
+        self.reason = reason
+
+
+def parse_line(line):
+    """Return the (uprn, usrn) pair on a CSV or JSONL line, None to skip it."""
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+            return str(record["uprn"]), str(record["usrn"])
+        except (ValueError, TypeError, KeyError) as err:
+            raise ValueError(f"bad JSON record ({type(err).__name__}: {err})") from err
+    row = next(csv.reader([line]))
+    if row and row[0].strip().lower() == "uprn":
+        return None
+    if len(row) < 2 or not row[0].strip() or not row[1].strip():
+        raise ValueError("expected uprn,usrn")
+    return row[0].strip(), row[1].strip()
+
+
+def read_pairs(paths):
+    """Yield (uprn, usrn) pairs from CSV or JSONL lines, or an InputError per bad line."""
+    for path in paths or ["-"]:
+        handle = sys.stdin if path == "-" else open(path, newline="")
+        try:
+            for number, line in enumerate(handle, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    pair = parse_line(line)
+                except ValueError as err:
+                    yield InputError(f"{path}:{number}", str(err))
+                    continue
+                if pair is not None:
+                    yield pair
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+
+class BulkLookup:
+    """Fetch and parse many properties over one pooled session."""
+
+    def __init__(self, session, const, parser, scheduler, args):
+        self.session = session
+        self.const = const
+        self.parser = parser
+        self.scheduler = scheduler
+        self.args = args
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.failures = {}
+
+    async def fetch(self, uprn, usrn):
+        """POST to the API, retrying transient failures with jittered backoff."""
+        payload = {"uprn": uprn, "usrn": usrn}
+        for attempt in range(self.args.retries + 1):
+            try:
+                async with self.session.post(
+                    self.args.url, headers=self.const.API_HEADERS, json=payload
+                ) as response:
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+                    error = f"HTTP {response.status}"
+                    if response.status not in RETRY_STATUSES:
+                        raise LookupError(error)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                error = type(err).__name__
+            if attempt < self.args.retries:
+                self.retries += 1
+                await asyncio.sleep(self.args.backoff * 2**attempt * random.uniform(0.5, 1.0))
+        raise LookupError(error)
+
+    def fail(self, reason):
+        """Count a failed lookup under its reason."""
+        self.failed += 1
+        self.failures[reason] = self.failures.get(reason, 0) + 1
+
+    async def lookup(self, uprn, usrn):
+        """Return the NDJSON record for a property."""
+        try:
+            result = await self.fetch(uprn, usrn)
+            # The same checks the integration applies before trusting a response
+            if not isinstance(result, dict) or not isinstance(result.get("dates"), str):
+                raise ValueError("API response has no dates")
+            bins = self.scheduler.roll_forward(
+                self.parser.parse_response(result), date.today()
+            )
+            # An unknown address comes back without any collections
+            if not any(bin_data["dates"] for bin_data in bins.values()):
+                raise LookupError("No collection dates")
+        except (LookupError, ValueError) as err:
+            reason = str(err) if isinstance(err, LookupError) else "Malformed response"
+        except Exception as err:  # pylint: disable=broad-except
+            # Keep the worker alive whatever one property throws up
+            reason = f"Unexpected error: {type(err).__name__}"
+        else:
+            self.succeeded += 1
+            if not self.args.full:
+                for bin_data in bins.values():
+                    del bin_data["dates"]
+            return {"uprn": uprn, "usrn": usrn, "ok": True, "bins": bins}
+        self.fail(reason)
+        return {"uprn": uprn, "usrn": usrn, "ok": False, "error": reason}
+
+    def invalid(self, error):
+        """Return the NDJSON record for an input line that could not be read."""
+        self.fail("Invalid input")
+        return {"input": error.source, "ok": False, "error": f"Invalid input: {error.reason}"}
+
+    async def worker(self, queue):
+        """Look up queued properties, writing each result as it completes."""
+        while (pair := await queue.get()) is not None:
+            record = await self.lookup(*pair)
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+
+
+async def run(args):
+    parser = load_parser()
+    const = importlib.import_module("canterbury_bins.const")
+    scheduler = importlib.import_module("canterbury_bins.scheduler")
+    args.url = args.url or const.API_URL
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    queue = asyncio.Queue(maxsize=args.concurrency * 2)
+    start = time.perf_counter()
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        bulk = BulkLookup(session, const, parser, scheduler, args)
+        workers = [
+            asyncio.create_task(bulk.worker(queue)) for _ in range(args.concurrency)
+        ]
+        for pair in read_pairs(args.inputs):
+            if isinstance(pair, InputError):
+                sys.stdout.write(json.dumps(bulk.invalid(pair)) + "\n")
+                continue
+            await queue.put(pair)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    elapsed = time.perf_counter() - start
+    total = bulk.succeeded + bulk.failed
+    print(
+        f"Looked up {total} properties in {elapsed:.1f}s "
+        f"({total / elapsed if elapsed else 0:.1f}/s): "
+        f"{bulk.succeeded} succeeded, {bulk.failed} failed, {bulk.retries} retries",
+        file=sys.stderr,
+    )
+    for reason, count in sorted(bulk.failures.items()):
+        print(f"  {reason}: {count}", file=sys.stderr)
+    return 1 if bulk.failed else 0
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("inputs", nargs="*", help="CSV or JSONL files, - for stdin")
+    argparser.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    argparser.add_argument("--retries", type=int, default=3, help="retries per property")
+    argparser.add_argument("--backoff", type=float, default=1.0, help="first retry delay in seconds")
+    argparser.add_argument("--timeout", type=float, default=10.0, help="request timeout in seconds")
+    argparser.add_argument("--url", help="API endpoint, e.g. a local mock_api.py")
+    argparser.add_argument("--full", action="store_true", help="include every collection date")
+    sys.exit(asyncio.run(run(argparser.parse_args())))
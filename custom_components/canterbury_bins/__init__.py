@@ -1,171 +1,369 @@
 """The Canterbury Bins integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-import json
-import aiohttp
-import async_timeout
+from datetime import date, datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    PLATFORMS,
+    CONF_PROPERTIES,
     CONF_UPRN,
     CONF_USRN,
-    API_URL,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    CONF_PROFILING,
     UPDATE_INTERVAL,
-    BIN_TYPES,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    PROPERTY_CONCURRENCY,
 )
+from .api import (
+    ApiConnectionError,
+    ApiRateLimitedError,
+    ApiServerError,
+    ApiTimeoutError,
+    CanterburyBinsApiError,
+    CircuitOpenError,
+    async_acquire_api,
+    async_pop_preseed,
+    async_release_api,
+)
+from .export import CanterburyBinsExportView
+from .health import backoff_delay
+from .history import CollectionHistory
+from .log import TRACE_LOGGER, Summary
+from .metrics import RefreshMetrics
+from .properties import PropertyState, entry_properties
+from .scheduler import next_refresh_interval, staggered_interval
+from .services import async_setup_services
+from .storage import CanterburyBinsCache
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Failures of the endpoint itself rather than of a property's data
+ENDPOINT_ERRORS = (
+    ApiTimeoutError,
+    ApiConnectionError,
+    ApiServerError,
+    ApiRateLimitedError,
+    CircuitOpenError,
+)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Canterbury Bins services and schedule export."""
+    async_setup_services(hass)
+    hass.http.register_view(CanterburyBinsExportView)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Canterbury Bins from a config entry."""
     _LOGGER.debug("Setting up Canterbury Bins integration")
     coordinator = CanterburyBinsCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    for prop in coordinator.properties.values():
+        await prop.history.async_load()
+    # Properties the config flow just fetched are served from the client cache
+    if seeded := coordinator.async_seed():
+        _LOGGER.debug(
+            "Seeded %d properties of entry %s from the config flow", seeded, entry.entry_id
+        )
+    if await coordinator.async_load_cache():
+        # Serve the cached payload straight away and refresh in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_refresh_{entry.entry_id}"
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await coordinator.async_unload()
+            raise
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    coordinator.async_schedule_rollover()
 
     # Set up platforms
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, ["sensor"]):
-        hass.data[DOMAIN].pop(entry.entry_id)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_unload()
     return unload_ok
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached payload and history when a config entry is deleted."""
+    await CanterburyBinsCache(hass, entry.entry_id).async_remove()
+    for prop in entry_properties(entry.data):
+        await CollectionHistory(hass, f"{entry.entry_id}.{prop[CONF_UPRN]}").async_remove()
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate single property entries to the list of properties format."""
+    if entry.version == 1:
+        uprn = entry.data[CONF_UPRN]
+        prefix = f"{DOMAIN}_"
+
+        @callback
+        def migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+            """Add the UPRN to unique IDs so they are unique across properties."""
+            unique_id = entity_entry.unique_id
+            for kind in ("next", "last"):
+                if unique_id.startswith(f"{prefix}{kind}_"):
+                    bin_key = unique_id.removeprefix(f"{prefix}{kind}_")
+                    return {"new_unique_id": f"{prefix}{uprn}_{kind}_{bin_key}"}
+            if unique_id.startswith(prefix) and unique_id.endswith(f"_{uprn}"):
+                # Diagnostic sensors belong to the entry rather than a property
+                key = unique_id.removeprefix(prefix).removesuffix(f"_{uprn}")
+                if key != "calendar":
+                    return {"new_unique_id": f"{prefix}{entry.entry_id}_{key}"}
+            return None
+
+        await er.async_migrate_entries(hass, entry.entry_id, migrate_unique_id)
+        # History used to be stored per entry rather than per property
+        await CollectionHistory(hass, f"{entry.entry_id}.{uprn}").async_adopt(
+            CollectionHistory(hass, entry.entry_id)
+        )
+        hass.config_entries.async_update_entry(
+            entry,
+            data={CONF_PROPERTIES: [{CONF_UPRN: uprn, CONF_USRN: entry.data[CONF_USRN]}]},
+            version=2,
+            unique_id=entry.unique_id or uprn,
+        )
+        _LOGGER.debug("Migrated Canterbury Bins entry %s to version 2", entry.entry_id)
+    return True
+
 class CanterburyBinsCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Canterbury Bins data."""
+    """Class to manage fetching Canterbury Bins data.
+
+    A coordinator serves every property in its config entry. Each scheduled
+    cycle fetches them with bounded concurrency and publishes a map of UPRN
+    to bin snapshots.
+    """
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize."""
-        self.uprn = entry.data[CONF_UPRN]
-        self.usrn = entry.data[CONF_USRN]
-        self._session = aiohttp.ClientSession()
-        _LOGGER.debug("Initialized coordinator with UPRN: %s, USRN: %s", self.uprn, self.usrn)
+        self.entry_id = entry.entry_id
+        self.properties: dict[str, PropertyState] = {
+            config[CONF_UPRN]: PropertyState(hass, entry.entry_id, config)
+            for config in entry_properties(entry.data)
+        }
+        self.api = async_acquire_api(hass)
+        self._cache = CanterburyBinsCache(hass, entry.entry_id)
+        self._min_interval = timedelta(
+            minutes=entry.options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        )
+        self._max_interval = timedelta(
+            minutes=entry.options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+        )
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+        # When the parsed payload last changed, used to validate exports
+        self.last_changed: datetime | None = None
+        self._concurrency = asyncio.Semaphore(PROPERTY_CONCURRENCY)
+        self.metrics = RefreshMetrics(entry.options.get(CONF_PROFILING, False))
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Initialized coordinator for UPRNs: %s", ", ".join(self.properties))
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(hours=UPDATE_INTERVAL),
+            # Snapshots compare by value, so identical refreshes notify nobody
+            always_update=False,
         )
 
+    async def _async_update_property(self, prop: PropertyState, today: date) -> bool:
+        """Fetch and apply the latest data for one property."""
+        async with self._concurrency:
+            with self.metrics.timer("network"):
+                result = await self.api.async_fetch(prop.uprn, prop.usrn)
+        if TRACE_LOGGER.isEnabledFor(logging.DEBUG):
+            TRACE_LOGGER.debug("Raw API response for UPRN %s: %s", prop.uprn, result)
+        return prop.update(result, today, self.metrics)
+
     async def _async_update_data(self):
         """Update data via API."""
         try:
-            _LOGGER.debug("Fetching data from API")
-            async with async_timeout.timeout(10):
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:137.0) Gecko/20100101 Firefox/137.0",
-                    "Accept": "*/*",
-                    "Accept-Language": "en-GB,en;q=0.5",
-                    "Content-Type": "application/json",
-                    "Origin": "https://www.canterbury.gov.uk",
-                }
-                
-                data = {
-                    "uprn": self.uprn,
-                    "usrn": self.usrn
-                }
-
-                _LOGGER.debug("Making API request to %s with data: %s", API_URL, data)
-                async with self._session.post(API_URL, headers=headers, json=data) as response:
-                    if response.status != 200:
-                        _LOGGER.error("API request failed with status %d", response.status)
-                        raise UpdateFailed(f"Error communicating with API: {response.status}")
-
-                    result = await response.json()
-                    _LOGGER.debug("Raw API response: %s", result)
-                    
-                    dates = json.loads(result.get("dates", "{}"))
-                    status = json.loads(result.get("status", "{}"))
-                    _LOGGER.debug("Parsed dates: %s", dates)
-                    _LOGGER.debug("Parsed status: %s", status)
-                    
-                    # Process each bin type's dates
-                    processed_dates = {}
-                    for bin_key, bin_name in BIN_TYPES.items():
-                        date_list = dates.get(bin_key, [])
-                        if date_list:
-                            # Sort dates to get the next collection date
-                            date_list.sort()
-                            next_date_str = date_list[0].split('T')[0]  # Remove time portion
-                            processed_dates[bin_key] = {
-                                "next_date": next_date_str,
-                                "future_dates": len(date_list) - 1
-                            }
-                            _LOGGER.debug("Processed dates for %s: %s", bin_key, processed_dates[bin_key])
-                        else:
-                            processed_dates[bin_key] = {
-                                "next_date": None,
-                                "future_dates": 0
-                            }
-                            _LOGGER.debug("No dates found for %s", bin_key)
-                    
-                    # Process status information
-                    street_status = status.get("streetStatus", [])
-                    last_collections = {}
-                    _LOGGER.debug("Processing street status: %s", street_status)
-                    
-                    # First, group events by bin type
-                    events_by_bin = {}
-                    for event in street_status:
-                        event_type = event.get("type", "").lower()
-                        # Map event types to our bin keys
-                        bin_key = {
-                            "general": "blackBinDay",
-                            "recycling": "recyclingBinDay",
-                            "food": "foodBinDay",
-                            "garden": "gardenBinDay"
-                        }.get(event_type)
-                        
-                        if bin_key:
-                            if bin_key not in events_by_bin:
-                                events_by_bin[bin_key] = []
-                            events_by_bin[bin_key].append(event)
-                    
-                    # Then find the most recent event for each bin type
-                    for bin_key, events in events_by_bin.items():
-                        if events:
-                            # Sort events by date (newest first)
-                            events.sort(key=lambda x: x.get("date", ""), reverse=True)
-                            most_recent = events[0]
-                            
-                            timestamp = most_recent.get("date", "")
-                            outcome = most_recent.get("outcome", "")
-                            workpack = most_recent.get("workpack", "")
-                            
-                            last_collections[bin_key] = {
-                                "timestamp": timestamp,
-                                "date": timestamp.split('T')[0],  # Keep date-only version for compatibility
-                                "outcome": outcome,
-                                "workpack": workpack
-                            }
-                            _LOGGER.debug("Most recent collection for %s: %s", bin_key, last_collections[bin_key])
-                    
-                    # Add last collection info to processed dates
-                    for bin_key in processed_dates:
-                        if bin_key in last_collections:
-                            processed_dates[bin_key]["last_collection"] = last_collections[bin_key]
-                            _LOGGER.debug("Added last collection info to %s: %s", bin_key, last_collections[bin_key])
-                    
-                    _LOGGER.debug("Final processed data: %s", processed_dates)
-                    return processed_dates
-
-        except Exception as err:
-            _LOGGER.exception("Error in _async_update_data: %s", err)
-            raise UpdateFailed(f"Error communicating with API: {err}")
+            with self.metrics.timer("refresh"):
+                return await self._async_update_properties()
+        finally:
+            # Counters are final once the results are handled
+            self.metrics.async_notify()
+
+    async def _async_update_properties(self) -> dict[str, dict]:
+        """Refresh every property, keeping the last data for any that fail."""
+        metrics = self.metrics
+        metrics.increment("refreshes")
+        metrics.payload_size = 0
+        today = dt_util.now().date()
+        props = list(self.properties.values())
+        schedules = [prop.schedules for prop in props]
+        results = await asyncio.gather(
+            *(self._async_update_property(prop, today) for prop in props),
+            return_exceptions=True,
+        )
+
+        changed = False
+        retry_in: timedelta | None = None
+        errors: list[Exception] = []
+        stale: list[Exception] = []
+        for prop, result in zip(props, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if not isinstance(result, Exception):
+                prop.failures = 0
+                changed |= result
+                continue
+            metrics.increment(f"failures.{type(result).__name__}")
+            if isinstance(result, CircuitOpenError):
+                delay = timedelta(seconds=result.retry_after)
+            else:
+                if not isinstance(result, (CanterburyBinsApiError, ValueError)):
+                    _LOGGER.error(
+                        "Unexpected error updating UPRN %s",
+                        prop.uprn,
+                        exc_info=result,
+                    )
+                prop.failures += 1
+                delay = timedelta(seconds=backoff_delay(prop.failures))
+            retry_in = delay if retry_in is None else min(retry_in, delay)
+            if prop.processed is not None and isinstance(result, ENDPOINT_ERRORS):
+                # The endpoint is struggling, keep serving the last good data
+                # rather than flapping between unavailable and stale
+                stale.append(result)
+            else:
+                errors.append(result)
+
+        if changed:
+            # The export only carries the schedule, so status-only changes
+            # and identical refreshes after a restart keep it valid
+            if any(prop.schedules != old for prop, old in zip(props, schedules)):
+                self.last_changed = dt_util.utcnow()
+            processed = {
+                prop.uprn: prop.processed for prop in props if prop.processed is not None
+            }
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Processed data for entry %s: %s", self.entry_id, Summary(processed))
+            self._cache.async_save(processed, self.last_changed)
+        self._schedule(retry_in)
+
+        if len(errors) == len(props):
+            err = errors[0]
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        if errors:
+            _LOGGER.warning(
+                "Failed to update %d of %d properties: %s", len(errors), len(props), errors[0]
+            )
+        if stale:
+            _LOGGER.warning(
+                "Serving last good data for %d of %d properties: %s",
+                len(stale),
+                len(props),
+                stale[0],
+            )
+        if not changed and self.data is not None:
+            return self.data
+        return self._snapshots()
+
+    def _snapshots(self) -> dict[str, dict]:
+        """Return the bin snapshots for every property, keyed by UPRN."""
+        return {uprn: prop.snapshots for uprn, prop in self.properties.items()}
+
+    @callback
+    def async_seed(self) -> int:
+        """Hand the responses the config flow fetched to the API client.
+
+        Seeded properties are then served from the client's cache by the
+        first refresh, so only properties without a fresh response are
+        fetched again. Returns the number of properties seeded.
+        """
+        seeded = 0
+        for uprn, prop in self.properties.items():
+            if (preseed := async_pop_preseed(self.hass, uprn, prop.usrn)) is not None:
+                self.api.prime(uprn, prop.usrn, *preseed)
+                seeded += 1
+        return seeded
+
+    async def async_load_cache(self) -> bool:
+        """Hydrate the coordinator from the on-disk cache."""
+        if (cached := await self._cache.async_load()) is None:
+            return False
+        fetched_at, data, self.last_changed = cached
+        _LOGGER.debug("Loaded cached data for entry %s from %s", self.entry_id, fetched_at)
+        today = dt_util.now().date()
+        for uprn, processed in data.items():
+            if (prop := self.properties.get(uprn)) is not None:
+                prop.restore(processed, today)
+        self._schedule()
+        self.async_set_updated_data(self._snapshots())
+        return True
+
+    def _schedule(self, retry_in: timedelta | None = None) -> None:
+        """Pick the next poll time from the collection schedules."""
+        now = dt_util.now()
+        interval = min(
+            next_refresh_interval(prop.processed, now, self._min_interval, self._max_interval)
+            for prop in self.properties.values()
+        )
+        interval = staggered_interval(
+            interval, self.entry_id, now, self._min_interval, self._max_interval
+        )
+        if retry_in is not None:
+            interval = min(interval, retry_in)
+        self.update_interval = interval
+        _LOGGER.debug("Next refresh for entry %s in %s", self.entry_id, self.update_interval)
+
+    @callback
+    def async_schedule_rollover(self) -> None:
+        """Arm the timer that advances the schedule at local midnight."""
+        if self._unsub_rollover:
+            self._unsub_rollover()
+        self._unsub_rollover = async_track_point_in_time(
+            self.hass,
+            self._async_handle_rollover,
+            dt_util.start_of_local_day() + timedelta(days=1),
+        )
+
+    @callback
+    def _async_handle_rollover(self, now: datetime) -> None:
+        """Advance each bin to its next future date without calling the API."""
+        self._unsub_rollover = None
+        if self.data is not None:
+            today = dt_util.as_local(now).date()
+            for prop in self.properties.values():
+                prop.roll_forward(today)
+            self.data = self._snapshots()
+            _LOGGER.debug("Rolled schedule forward for entry %s", self.entry_id)
+            self.async_update_listeners()
+        self.async_schedule_rollover()
 
     async def async_unload(self):
         """Unload the coordinator."""
-        await self._session.close() 
\ No newline at end of file
+        if self._unsub_rollover:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+        # Pending delayed writes must not outlive the entry
+        await self._cache.async_flush()
+        for prop in self.properties.values():
+            await prop.history.async_flush()
+        async_release_api(self.hass)
\ No newline at end of file
@@ -0,0 +1,325 @@
+"""API client for the Canterbury Bins integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import logging
+import time
+from typing import Any
+
+import aiohttp
+import async_timeout
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    API_URL,
+    API_HEADERS,
+    API_TIMEOUT,
+    API_MAX_CONNECTIONS,
+    API_FRESHNESS,
+    API_RATE_LIMIT,
+    API_RATE_BURST,
+    DATA_API,
+    DATA_PRESEED,
+)
+from .health import EndpointHealth
+from .limiter import TokenBucket
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CanterburyBinsApi:
+    """Domain-wide client shared by every Canterbury Bins config entry.
+
+    Requests go through Home Assistant's shared aiohttp session, so every
+    entry reuses the same keep-alive connection pool, TLS sessions and DNS
+    cache. Every request waits for a token from a domain-wide token bucket
+    (``rate_limit`` requests per second) and the number of concurrent
+    requests is capped by ``max_connections``, so hundreds of entries do not
+    trip upstream throttling.
+
+    The client also acts as a fetch broker. Concurrent fetches for the same
+    (UPRN, USRN) share a single in-flight request, responses are reused for
+    ``freshness`` seconds, and the ``status`` section (which is per street)
+    is shared between every property on the same USRN so each entry sees the
+    newest street status any of its neighbours has fetched.
+
+    Failures are classified, and timeouts, connection errors, server errors
+    and throttling count towards a circuit breaker that pauses requests from
+    every entry while the endpoint is failing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession | None = None,
+        url: str = API_URL,
+        freshness: float = API_FRESHNESS,
+        rate_limit: float = API_RATE_LIMIT,
+        max_connections: int = API_MAX_CONNECTIONS,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.url = url
+        self.freshness = freshness
+        self._session = session or async_get_clientsession(hass)
+        self._connections = asyncio.Semaphore(max_connections)
+        self._limiter = TokenBucket(rate_limit, API_RATE_BURST)
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._responses: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+        self._streets: dict[str, tuple[float, str]] = {}
+        self.health = EndpointHealth(url)
+        self.counters: Counter[str] = Counter()
+        self.users = 0
+
+    async def async_fetch(
+        self, uprn: str, usrn: str, timeout: float = API_TIMEOUT
+    ) -> dict[str, Any]:
+        """Return the bin dates response for a property.
+
+        ``timeout`` bounds the request itself, not the wait for a rate limit
+        token or a connection. A caller joining a request that is already in
+        flight shares that request's timeout.
+
+        The returned dict may be shared with other callers and must not be
+        modified.
+        """
+        key = (uprn, usrn)
+        now = time.monotonic()
+
+        if (cached := self._responses.get(key)) is not None:
+            fetched_at, result = cached
+            if now - fetched_at < self.freshness:
+                _LOGGER.debug("Reusing cached response for UPRN %s", uprn)
+                self.counters["cache_hits"] += 1
+                return self._with_street_status(usrn, fetched_at, result)
+
+        if (task := self._inflight.get(key)) is None:
+            task = asyncio.ensure_future(self._async_request(uprn, usrn, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._request_done(key, done))
+        else:
+            _LOGGER.debug("Joining in-flight request for UPRN %s", uprn)
+            self.counters["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        """Forget a finished request and drop the client if it is no longer used."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Awaiting callers get the exception through the shield, but a
+            # request whose callers all gave up would otherwise log it as
+            # never retrieved
+            task.exception()
+        if self.users <= 0 and not self._inflight:
+            _async_drop_api(self.hass, self)
+
+    @property
+    def busy(self) -> bool:
+        """Return whether any request is still in flight."""
+        return bool(self._inflight)
+
+    def _with_street_status(
+        self, usrn: str, fetched_at: float, result: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Swap in a newer street status fetched for a neighbouring property."""
+        street = self._streets.get(usrn)
+        if street is None or street[0] <= fetched_at:
+            return result
+        if time.monotonic() - street[0] >= self.freshness:
+            return result
+        return {**result, "status": street[1]}
+
+    def _store(self, uprn: str, usrn: str, result: dict[str, Any]) -> None:
+        """Cache a response and its street status, pruning expired entries."""
+        now = time.monotonic()
+        expired = now - self.freshness
+        for key in [k for k, (t, _) in self._responses.items() if t <= expired]:
+            del self._responses[key]
+        for street in [k for k, (t, _) in self._streets.items() if t <= expired]:
+            del self._streets[street]
+
+        self._responses[(uprn, usrn)] = (now, result)
+        if "status" in result:
+            self._streets[usrn] = (now, result["status"])
+
+    def prime(
+        self, uprn: str, usrn: str, fetched_at: float, result: dict[str, Any]
+    ) -> None:
+        """Cache a response fetched outside this client, unless it is stale."""
+        key = (uprn, usrn)
+        if time.monotonic() - fetched_at >= self.freshness:
+            return
+        if (cached := self._responses.get(key)) is not None and cached[0] >= fetched_at:
+            return
+        self._responses[key] = (fetched_at, result)
+        street = self._streets.get(usrn)
+        if "status" in result and (street is None or street[0] < fetched_at):
+            self._streets[usrn] = (fetched_at, result["status"])
+
+    async def _async_request(self, uprn: str, usrn: str, timeout: float) -> dict[str, Any]:
+        """Make the API request for a property."""
+        if (retry_after := self.health.before_request()) is not None:
+            self.counters["circuit_open"] += 1
+            raise CircuitOpenError(retry_after)
+
+        await self._limiter.async_acquire()
+        self.counters["requests"] += 1
+        try:
+            result = await self._async_post(uprn, usrn, timeout)
+        except (
+            ApiTimeoutError,
+            ApiConnectionError,
+            ApiServerError,
+            ApiRateLimitedError,
+        ) as err:
+            self.counters[f"failures.{type(err).__name__}"] += 1
+            self.health.record_failure(err, getattr(err, "retry_after", None))
+            raise
+        except CanterburyBinsApiError as err:
+            # The endpoint answered, the problem is with this property
+            self.counters[f"failures.{type(err).__name__}"] += 1
+            self.health.record_success()
+            raise
+
+        self.health.record_success()
+        self._store(uprn, usrn, result)
+        return result
+
+    async def _async_post(self, uprn: str, usrn: str, timeout: float) -> dict[str, Any]:
+        """POST to the endpoint and classify any failure."""
+        payload = {"uprn": uprn, "usrn": usrn}
+        async with self._connections:
+            _LOGGER.debug("Making API request to %s with data: %s", self.url, payload)
+            try:
+                async with async_timeout.timeout(timeout):
+                    async with self._session.post(
+                        self.url, headers=API_HEADERS, json=payload
+                    ) as response:
+                        if response.status == 429:
+                            raise ApiRateLimitedError(
+                                _retry_after(response.headers.get("Retry-After"))
+                            )
+                        if response.status >= 500:
+                            raise ApiServerError(
+                                f"API request failed with status {response.status}"
+                            )
+                        if response.status != 200:
+                            raise CanterburyBinsApiError(
+                                f"API request failed with status {response.status}"
+                            )
+                        result = await response.json(content_type=None)
+            except asyncio.TimeoutError as err:
+                raise ApiTimeoutError("Timed out waiting for the API") from err
+            except aiohttp.ClientError as err:
+                raise ApiConnectionError(f"Error connecting to the API: {err}") from err
+            except ValueError as err:
+                raise MalformedResponseError(f"API returned invalid JSON: {err}") from err
+
+        if not isinstance(result, dict) or not isinstance(result.get("dates"), str):
+            raise MalformedResponseError("API response has no dates")
+        return result
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class CanterburyBinsApiError(HomeAssistantError):
+    """Error to indicate the API returned an unexpected response."""
+
+
+class ApiTimeoutError(CanterburyBinsApiError):
+    """Error to indicate the API did not respond in time."""
+
+
+class ApiConnectionError(CanterburyBinsApiError):
+    """Error to indicate we cannot connect to the API."""
+
+
+class ApiServerError(CanterburyBinsApiError):
+    """Error to indicate the API returned a server error."""
+
+
+class ApiRateLimitedError(CanterburyBinsApiError):
+    """Error to indicate the API is throttling requests."""
+
+    def __init__(self, retry_after: float | None = None) -> None:
+        """Initialize."""
+        super().__init__("API is rate limiting requests")
+        self.retry_after = retry_after
+
+
+class MalformedResponseError(CanterburyBinsApiError):
+    """Error to indicate the API response could not be understood."""
+
+
+class CircuitOpenError(CanterburyBinsApiError):
+    """Error to indicate requests are paused while the API is failing."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize."""
+        super().__init__(f"API is failing, retrying in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def async_acquire_api(hass: HomeAssistant) -> CanterburyBinsApi:
+    """Return the shared API client, creating it for the first config entry."""
+    api: CanterburyBinsApi | None = hass.data.get(DATA_API)
+    if api is None:
+        api = hass.data[DATA_API] = CanterburyBinsApi(hass)
+        _LOGGER.debug("Created shared Canterbury Bins API client")
+    api.users += 1
+    return api
+
+
+def async_release_api(hass: HomeAssistant) -> None:
+    """Release the shared API client, dropping it with the last config entry."""
+    api: CanterburyBinsApi | None = hass.data.get(DATA_API)
+    if api is None:
+        return
+    api.users -= 1
+    # Requests still in flight keep the client, and the responses they cache,
+    # until they finish
+    if api.users <= 0 and not api.busy:
+        _async_drop_api(hass, api)
+
+
+def _async_drop_api(hass: HomeAssistant, api: CanterburyBinsApi) -> None:
+    """Drop the shared API client once nothing uses it."""
+    if hass.data.get(DATA_API) is api:
+        hass.data.pop(DATA_API)
+        _LOGGER.debug("Released shared Canterbury Bins API client")
+
+
+@callback
+def async_preseed(hass: HomeAssistant, uprn: str, usrn: str, result: dict[str, Any]) -> None:
+    """Keep a response fetched by the config flow for the entry it creates."""
+    preseed: dict[tuple[str, str], tuple[float, dict[str, Any]]]
+    preseed = hass.data.setdefault(DATA_PRESEED, {})
+    # Drop responses left behind by flows that were abandoned
+    expired = time.monotonic() - API_FRESHNESS
+    for key in [k for k, (t, _) in preseed.items() if t <= expired]:
+        del preseed[key]
+    preseed[(uprn, usrn)] = (time.monotonic(), result)
+
+
+@callback
+def async_pop_preseed(
+    hass: HomeAssistant, uprn: str, usrn: str
+) -> tuple[float, dict[str, Any]] | None:
+    """Return and forget the config flow's response for a property and when it was fetched."""
+    preseed = hass.data.get(DATA_PRESEED)
+    if not preseed or (seeded := preseed.pop((uprn, usrn), None)) is None:
+        return None
+    if not preseed:
+        hass.data.pop(DATA_PRESEED)
+    return seeded
@@ -0,0 +1,80 @@
+"""Calendar platform for Canterbury Bins."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, BIN_TYPES
+from .properties import PropertyState
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up a Canterbury Bins calendar for each property."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        CanterburyBinsCalendar(coordinator, prop) for prop in coordinator.properties.values()
+    )
+
+
+def _collection_event(bin_key: str, day: date) -> CalendarEvent:
+    """Return the all-day event for a collection."""
+    return CalendarEvent(
+        start=day,
+        end=day + timedelta(days=1),
+        summary=f"{BIN_TYPES[bin_key]} Collection",
+    )
+
+
+class CanterburyBinsCalendar(CoordinatorEntity, CalendarEntity):
+    """Calendar of upcoming Canterbury Bins collections."""
+
+    _attr_icon = "mdi:delete-empty"
+
+    def __init__(self, coordinator, prop: PropertyState) -> None:
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._property = prop
+        prefix = f"{prop.name} " if len(coordinator.properties) > 1 else ""
+        self._attr_name = f"{prefix}Bin Collections"
+        self._attr_unique_id = f"canterbury_bins_calendar_{prop.uprn}"
+        self._attr_device_info = prop.device_info
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming collection."""
+        today = dt_util.now().date()
+        upcoming = [
+            (day, bin_key)
+            for bin_key, schedule in self._property.schedules.items()
+            if (day := schedule.next_on_or_after(today)) is not None
+        ]
+        if not upcoming:
+            return None
+        day, bin_key = min(upcoming)
+        return _collection_event(bin_key, day)
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the collections between two times."""
+        start = dt_util.as_local(start_date).date()
+        end_local = dt_util.as_local(end_date)
+        # All-day events finish at midnight, so an end at midnight excludes that day
+        end = end_local.date() - timedelta(days=1 if end_local.time() == time.min else 0)
+        events = [
+            _collection_event(bin_key, day)
+            for bin_key, schedule in self._property.schedules.items()
+            for day in schedule.between(start, end)
+        ]
+        events.sort(key=lambda event: event.start)
+        return events
@@ -1,17 +1,45 @@
 """Config flow for Canterbury Bins."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import FlowResult
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import AbortFlow, FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 
-from .const import DOMAIN, CONF_UPRN, CONF_USRN
+from .api import (
+    ApiConnectionError,
+    ApiRateLimitedError,
+    ApiServerError,
+    ApiTimeoutError,
+    CanterburyBinsApiError,
+    CircuitOpenError,
+    async_acquire_api,
+    async_preseed,
+    async_release_api,
+)
+from .const import (
+    DOMAIN,
+    CONF_ADDITIONAL_PROPERTIES,
+    CONF_NAME,
+    CONF_PROPERTIES,
+    CONF_UPRN,
+    CONF_USRN,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    CONF_PROFILING,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    VALIDATION_TIMEOUT,
+)
+from .parser import decode_section, parse_dates
+from .properties import entry_properties
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,20 +47,94 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_UPRN): str,
         vol.Required(CONF_USRN): str,
+        # One "uprn,usrn[,name]" line per extra property served by this entry
+        vol.Optional(CONF_ADDITIONAL_PROPERTIES): TextSelector(
+            TextSelectorConfig(multiline=True)
+        ),
     }
 )
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> None:
-    """Validate the user input allows us to connect."""
-    # Here we can add validation if needed
-    # For now, we'll just check that the values are not empty
-    if not data[CONF_UPRN] or not data[CONF_USRN]:
+def parse_properties(data: dict[str, Any]) -> list[dict[str, str]]:
+    """Return the properties described by the user input."""
+    properties = [{CONF_UPRN: data[CONF_UPRN].strip(), CONF_USRN: data[CONF_USRN].strip()}]
+    for line in (data.get(CONF_ADDITIONAL_PROPERTIES) or "").splitlines():
+        if not (line := line.strip()):
+            continue
+        fields = [field.strip() for field in line.split(",", 2)]
+        if len(fields) < 2:
+            raise InvalidInput
+        prop = {CONF_UPRN: fields[0], CONF_USRN: fields[1]}
+        if len(fields) == 3 and fields[2]:
+            prop[CONF_NAME] = fields[2]
+        properties.append(prop)
+    if any(not prop[CONF_UPRN] or not prop[CONF_USRN] for prop in properties):
         raise InvalidInput
+    if len({prop[CONF_UPRN] for prop in properties}) != len(properties):
+        raise InvalidInput
+    return properties
+
+async def validate_input(hass: HomeAssistant, properties: list[dict[str, str]]) -> None:
+    """Validate each property by fetching its collections through the shared client.
+
+    The responses are kept so that setting up the entry does not fetch them
+    again straight away.
+    """
+    api = async_acquire_api(hass)
+    try:
+        # The timeout covers each request, not the wait for the rate limiter,
+        # so entries with many properties can still be validated. Every fetch
+        # is awaited so none outlives the flow unobserved.
+        results = await asyncio.gather(
+            *(
+                api.async_fetch(prop[CONF_UPRN], prop[CONF_USRN], VALIDATION_TIMEOUT)
+                for prop in properties
+            ),
+            return_exceptions=True,
+        )
+    finally:
+        async_release_api(hass)
+
+    for result in results:
+        if isinstance(
+            result,
+            (
+                ApiTimeoutError,
+                ApiConnectionError,
+                ApiServerError,
+                ApiRateLimitedError,
+                CircuitOpenError,
+            ),
+        ):
+            raise CannotConnect from result
+        if isinstance(result, CanterburyBinsApiError):
+            raise InvalidAddress from result
+        if isinstance(result, BaseException):
+            raise result
+
+    for prop, result in zip(properties, results):
+        try:
+            dates = parse_dates(decode_section(result["dates"]))
+        except ValueError as err:
+            raise InvalidAddress from err
+        # An unknown address comes back without any collections
+        if not any(bin_dates["dates"] for bin_dates in dates.values()):
+            raise InvalidAddress
+
+    for prop, result in zip(properties, results):
+        async_preseed(hass, prop[CONF_UPRN], prop[CONF_USRN], result)
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Canterbury Bins."""
 
-    VERSION = 1
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -42,16 +144,31 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             try:
-                await validate_input(self.hass, user_input)
+                properties = parse_properties(user_input)
             except InvalidInput:
                 errors["base"] = "invalid_input"
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
             else:
+                await self.async_set_unique_id(properties[0][CONF_UPRN])
+                self._abort_if_unique_id_configured()
+                self._abort_if_properties_configured(properties)
+                try:
+                    await validate_input(self.hass, properties)
+                except CannotConnect:
+                    errors["base"] = "cannot_connect"
+                except InvalidAddress:
+                    errors["base"] = "invalid_address"
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Unexpected exception")
+                    errors["base"] = "unknown"
+            if not errors:
+                title = (
+                    properties[0][CONF_UPRN]
+                    if len(properties) == 1
+                    else f"{len(properties)} properties"
+                )
                 return self.async_create_entry(
-                    title=f"Canterbury Bins ({user_input[CONF_UPRN]})",
-                    data=user_input,
+                    title=f"Canterbury Bins ({title})",
+                    data={CONF_PROPERTIES: properties},
                 )
 
         return self.async_show_form(
@@ -60,5 +177,63 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    @callback
+    def _abort_if_properties_configured(self, properties: list[dict[str, str]]) -> None:
+        """Abort if another entry already serves any of the properties."""
+        configured = {
+            prop[CONF_UPRN]
+            for entry in self._async_current_entries(include_ignore=False)
+            for prop in entry_properties(entry.data)
+        }
+        if any(prop[CONF_UPRN] in configured for prop in properties):
+            raise AbortFlow("already_configured")
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Canterbury Bins options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling intervals and profiling."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MIN_INTERVAL,
+                        default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                    vol.Required(
+                        CONF_MAX_INTERVAL,
+                        default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                    vol.Required(
+                        CONF_PROFILING,
+                        default=options.get(CONF_PROFILING, False),
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
+
 class InvalidInput(HomeAssistantError):
-    """Error to indicate we cannot connect.""" 
\ No newline at end of file
+    """Error to indicate the input is incomplete or repeats a property."""
+
+class CannotConnect(HomeAssistantError):
+    """Error to indicate we cannot connect."""
+
+class InvalidAddress(HomeAssistantError):
+    """Error to indicate the API does not know the property.""" 
\ No newline at end of file
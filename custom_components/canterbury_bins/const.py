@@ -1,13 +1,74 @@
 """Constants for the Canterbury Bins integration."""
+from datetime import time
+
 DOMAIN = "canterbury_bins"
+PLATFORMS = ["sensor", "calendar"]
 CONF_UPRN = "uprn"
 CONF_USRN = "usrn"
+CONF_NAME = "name"
+CONF_PROPERTIES = "properties"
+CONF_ADDITIONAL_PROPERTIES = "additional_properties"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_PROFILING = "profiling"
 API_URL = "https://zbr7r13ke2.execute-api.eu-west-2.amazonaws.com/Beta/get-bin-dates"
-UPDATE_INTERVAL = 1  # Update every 1 hour
+API_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:137.0) Gecko/20100101 Firefox/137.0",
+    "Accept": "*/*",
+    "Accept-Language": "en-GB,en;q=0.5",
+    "Content-Type": "application/json",
+    "Origin": "https://www.canterbury.gov.uk",
+}
+API_TIME_ZONE = "Europe/London"  # Street status timestamps are council local time
+API_TIMEOUT = 10  # Seconds
+VALIDATION_TIMEOUT = 5  # Seconds the config flow waits for a validating fetch
+API_MAX_CONNECTIONS = 4  # Concurrent requests across all entries
+API_RATE_LIMIT = 1.0  # Requests per second across all entries
+API_RATE_BURST = 5  # Requests allowed back to back before rate limiting
+API_FRESHNESS = 300  # Seconds a response or street status can be reused
+API_BACKOFF_BASE = 60  # Seconds before the first retry after a failure
+API_BACKOFF_MAX = 3600  # Longest retry backoff in seconds
+CIRCUIT_THRESHOLD = 3  # Consecutive endpoint failures before pausing requests
+PROPERTY_CONCURRENCY = 4  # Properties of one entry fetched at the same time
+UPDATE_INTERVAL = 1  # Update every 1 hour until the schedule is known
+DEFAULT_MIN_INTERVAL = 15  # Minutes between polls while crews are out
+DEFAULT_MAX_INTERVAL = 720  # Minutes between polls when no collection is due
+STAGGER_WINDOW = 60  # Longest spacing in minutes of the refresh phase grid
+STAGGER_FRACTION = 0.1  # Phase grid spacing as a fraction of the interval
+COLLECTION_DAY_START = time(6, 0)  # Crews start collecting
+COLLECTION_DAY_END = time(18, 0)  # Collection outcomes have landed
+
+CACHE_VERSION = 3  # Bump when the processed payload format changes
+CACHE_SAVE_DELAY = 10  # Seconds to batch cache writes
+
+HISTORY_VERSION = 1
+HISTORY_SIZE = 2000  # Street status events kept per property
+HISTORY_SAVE_DELAY = 30  # Seconds to batch history writes
+DEFAULT_HISTORY_WEEKS = 4
+COLLECTED_OUTCOMES = {"collected", "complete", "completed"}  # Lower case outcomes that are not misses
+
+EXPORT_URL = f"/api/{DOMAIN}/{{entry_id}}/schedule.{{fmt:(ics|json)}}"
+
+SERVICE_GET_COLLECTION_HISTORY = "get_collection_history"
+ATTR_WEEKS = "weeks"
+
+DATA_API = f"{DOMAIN}_api"
+DATA_PRESEED = f"{DOMAIN}_preseed"  # Responses fetched by the config flow
+
+TRACE_LOGGER_NAME = f"{DOMAIN}.trace"  # Opt-in logger for raw API responses
+LOG_SUMMARY_LENGTH = 200  # Characters of a payload shown in debug logs
 
 BIN_TYPES = {
     "blackBinDay": "Black Bin",
     "recyclingBinDay": "Recycling",
     "gardenBinDay": "Garden",
     "foodBinDay": "Food"
-} 
\ No newline at end of file
+}
+
+# Street status event types mapped to bin keys
+EVENT_TYPES = {
+    "general": "blackBinDay",
+    "recycling": "recyclingBinDay",
+    "food": "foodBinDay",
+    "garden": "gardenBinDay",
+}
@@ -0,0 +1,40 @@
+"""Diagnostics support for Canterbury Bins."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_NAME, CONF_UPRN, CONF_USRN
+
+TO_REDACT = {CONF_NAME, CONF_UPRN, CONF_USRN, "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "properties": [
+                {
+                    "failures": prop.failures,
+                    "history_events": len(prop.history),
+                    "processed": prop.processed,
+                }
+                for prop in coordinator.properties.values()
+            ],
+            "metrics": coordinator.metrics.as_dict(),
+        },
+        "api": {
+            "users": coordinator.api.users,
+            "health": coordinator.api.health.as_dict(),
+            "counters": dict(coordinator.api.counters),
+        },
+    }
@@ -0,0 +1,145 @@
+"""Schedule export for the Canterbury Bins integration."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+import json
+import logging
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, BIN_TYPES, EXPORT_URL
+from .parser import fingerprint
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "ics": "text/calendar; charset=utf-8",
+    "json": "application/json",
+}
+
+
+def _ics_text(value: str) -> str:
+    """Escape a value for an iCalendar TEXT property."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def iter_ics(coordinator, stamp: datetime) -> Iterator[str]:
+    """Yield the schedule as iCalendar, one chunk per bin."""
+    yield (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//Canterbury Bins//Home Assistant//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        "X-WR-CALNAME:Bin Collections\r\n"
+    )
+    dtstamp = stamp.strftime("%Y%m%dT%H%M%SZ")
+    prefixed = len(coordinator.properties) > 1
+    for uprn, prop in coordinator.properties.items():
+        prefix = f"{prop.name} " if prefixed else ""
+        for bin_key, schedule in prop.schedules.items():
+            summary = _ics_text(f"{prefix}{BIN_TYPES[bin_key]} Collection")
+            yield "".join(
+                "BEGIN:VEVENT\r\n"
+                f"UID:{uprn}-{bin_key}-{day:%Y%m%d}@{DOMAIN}\r\n"
+                f"DTSTAMP:{dtstamp}\r\n"
+                f"DTSTART;VALUE=DATE:{day:%Y%m%d}\r\n"
+                f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}\r\n"
+                f"SUMMARY:{summary}\r\n"
+                "TRANSP:TRANSPARENT\r\n"
+                "END:VEVENT\r\n"
+                for day in schedule
+            )
+    yield "END:VCALENDAR\r\n"
+
+
+def iter_json(coordinator, stamp: datetime) -> Iterator[str]:
+    """Yield the schedule as JSON, one chunk per property."""
+    yield f'{{"updated": {json.dumps(stamp.isoformat())}, "properties": ['
+    for index, (uprn, prop) in enumerate(coordinator.properties.items()):
+        document = {
+            "uprn": uprn,
+            "name": prop.name,
+            "bins": {
+                bin_key: {
+                    "name": BIN_TYPES[bin_key],
+                    "dates": [day.isoformat() for day in schedule],
+                }
+                for bin_key, schedule in prop.schedules.items()
+            },
+        }
+        yield ("," if index else "") + json.dumps(document)
+    yield "]}"
+
+
+class CanterburyBinsExportView(HomeAssistantView):
+    """Serve an entry's full collection schedule as iCalendar or JSON.
+
+    The schedule comes from the coordinator's parsed data, so polling the
+    export never calls the council API. Responses carry an ETag and
+    Last-Modified derived from when the data last changed, so clients that
+    revalidate get a 304 until the next change.
+    """
+
+    url = EXPORT_URL
+    name = f"api:{DOMAIN}:schedule"
+
+    async def get(self, request: web.Request, entry_id: str, fmt: str) -> web.StreamResponse:
+        """Return the schedule for a config entry."""
+        hass: HomeAssistant = request.app["hass"]
+        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is None or coordinator.last_changed is None:
+            return self.json_message("Schedule not available", HTTPStatus.NOT_FOUND)
+
+        last_changed = dt_util.as_utc(coordinator.last_changed)
+        etag = f'"{fingerprint(f"{entry_id}:{fmt}:{last_changed.isoformat()}").hex()}"'
+        # HTTP dates have whole second resolution
+        changed = last_changed.replace(microsecond=0)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(changed, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+        if _not_modified(request, etag, changed):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        response = web.StreamResponse(
+            headers={**headers, "Content-Type": CONTENT_TYPES[fmt]}
+        )
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        chunks = iter_ics if fmt == "ics" else iter_json
+        for chunk in chunks(coordinator, changed):
+            await response.write(chunk.encode())
+        await response.write_eof()
+        _LOGGER.debug("Exported %s schedule for entry %s", fmt, entry_id)
+        return response
+
+
+def _not_modified(request: web.Request, etag: str, changed: datetime) -> bool:
+    """Return whether the client's cached copy is still current."""
+    if (if_none_match := request.headers.get("If-None-Match")) is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        return if_none_match.strip() == "*" or etag in (
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        )
+    if (if_modified_since := request.headers.get("If-Modified-Since")) is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return changed <= since
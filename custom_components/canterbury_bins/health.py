@@ -0,0 +1,82 @@
+"""Endpoint health tracking for the Canterbury Bins integration."""
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+from .const import API_BACKOFF_BASE, API_BACKOFF_MAX, CIRCUIT_THRESHOLD
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def backoff_delay(failures: int) -> float:
+    """Return a jittered exponential backoff delay in seconds."""
+    delay = min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2 ** max(failures - 1, 0))
+    # Full jitter on the upper half stops entries retrying in lockstep
+    return delay * random.uniform(0.5, 1.0)
+
+
+class EndpointHealth:
+    """Circuit breaker shared by every request to one endpoint.
+
+    After ``CIRCUIT_THRESHOLD`` consecutive failures the circuit opens and
+    requests are refused until a jittered backoff has passed. A single probe
+    request is then let through. If it succeeds the circuit closes, and if it
+    fails the circuit opens again for longer.
+    """
+
+    def __init__(self, url: str) -> None:
+        """Initialize."""
+        self.url = url
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.last_error: str | None = None
+        self._retry_at = 0.0
+
+    @property
+    def retry_after(self) -> float:
+        """Return the seconds until the circuit lets a request through."""
+        return max(self._retry_at - time.monotonic(), 0.0)
+
+    def before_request(self) -> float | None:
+        """Return how long to wait if the circuit refuses a request."""
+        if self.state == STATE_CLOSED:
+            return None
+        if (retry_after := self.retry_after) > 0:
+            return retry_after
+        # Let one probe through, others wait until it has had time to finish
+        self.state = STATE_HALF_OPEN
+        self._retry_at = time.monotonic() + API_BACKOFF_BASE
+        return None
+
+    def record_success(self) -> None:
+        """Close the circuit after the endpoint responded."""
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._retry_at = 0.0
+
+    def record_failure(self, err: Exception, retry_after: float | None = None) -> None:
+        """Count a failure, opening the circuit when the threshold is reached."""
+        self.failures += 1
+        self.last_error = type(err).__name__
+        if (
+            self.state == STATE_HALF_OPEN
+            or self.failures >= CIRCUIT_THRESHOLD
+            or retry_after is not None
+        ):
+            delay = max(backoff_delay(self.failures), retry_after or 0.0)
+            self.state = STATE_OPEN
+            self._retry_at = time.monotonic() + delay
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the health state for diagnostics."""
+        return {
+            "url": self.url,
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "last_error": self.last_error,
+            "retry_after": round(self.retry_after, 1),
+        }
@@ -0,0 +1,138 @@
+"""Collection history for the Canterbury Bins integration."""
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    BIN_TYPES,
+    COLLECTED_OUTCOMES,
+    HISTORY_SIZE,
+    HISTORY_VERSION,
+    HISTORY_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# (bin key, timestamp, outcome, workpack)
+Event = tuple[str, str, str, str]
+
+
+class CollectionHistory:
+    """Bounded, deduplicated history of street status events for an entry.
+
+    Events are identified by bin, timestamp and workpack. Only events that
+    have not been seen before are merged in, and once ``maxlen`` events are
+    held the oldest are evicted ring-buffer style. Events no newer than the
+    last evicted one are not merged back in. The history is written to
+    disk only after new events arrive, with writes batched.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, maxlen: int = HISTORY_SIZE) -> None:
+        """Initialize."""
+        self._store = Store(hass, HISTORY_VERSION, f"{DOMAIN}.{entry_id}.history")
+        self._maxlen = maxlen
+        self._events: deque[Event] = deque()
+        self._seen: set[tuple[str, str, str]] = set()
+        # Timestamp of the newest evicted event, older events are not re-added
+        self._floor = ""
+        self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of events held."""
+        return len(self._events)
+
+    async def async_load(self) -> None:
+        """Load the history from disk."""
+        if stored := await self._store.async_load():
+            self._floor = stored.get("floor", "")
+            self._append(tuple(event) for event in stored.get("events", ()))
+
+    def _append(self, events: Iterable[Event]) -> int:
+        """Append unseen events, evicting the oldest beyond the limit."""
+        added = 0
+        for event in events:
+            identity = (event[0], event[1], event[3])
+            if identity in self._seen:
+                continue
+            self._seen.add(identity)
+            self._events.append(event)
+            added += 1
+            if len(self._events) > self._maxlen:
+                oldest = self._events.popleft()
+                self._seen.discard((oldest[0], oldest[1], oldest[3]))
+                self._floor = max(self._floor, oldest[1])
+        return added
+
+    def async_merge(self, events: Iterable[Event]) -> int:
+        """Merge new events in oldest first and schedule a save."""
+        new = sorted(
+            (
+                event
+                for event in events
+                if event[1] > self._floor
+                and (event[0], event[1], event[3]) not in self._seen
+            ),
+            key=lambda event: event[1],
+        )
+        if not new:
+            return 0
+        added = self._append(new)
+        _LOGGER.debug("Added %d collection events to history", added)
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+        return added
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the history to write to disk."""
+        self._dirty = False
+        return {"floor": self._floor, "events": list(self._events)}
+
+    def summary(self, since: datetime) -> dict[str, dict[str, Any]]:
+        """Return collection outcomes and miss rates per bin since a time."""
+        cutoff = since.strftime("%Y-%m-%dT%H:%M:%S")
+        bins: dict[str, dict[str, Any]] = {
+            bin_key: {"name": bin_name, "collections": 0, "missed": 0, "outcomes": {}}
+            for bin_key, bin_name in BIN_TYPES.items()
+        }
+        for bin_key, timestamp, outcome, _ in self._events:
+            if timestamp < cutoff or bin_key not in bins:
+                continue
+            stats = bins[bin_key]
+            stats["collections"] += 1
+            stats["outcomes"][outcome] = stats["outcomes"].get(outcome, 0) + 1
+            if outcome.lower() not in COLLECTED_OUTCOMES:
+                stats["missed"] += 1
+        for stats in bins.values():
+            stats["miss_rate"] = (
+                round(stats["missed"] / stats["collections"], 3)
+                if stats["collections"]
+                else None
+            )
+        return bins
+
+    async def async_flush(self) -> None:
+        """Write unsaved events now, cancelling the delayed write."""
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_adopt(self, other: CollectionHistory) -> None:
+        """Take over the events stored by another history and remove it."""
+        await other.async_load()
+        if other._events:
+            self._floor = max(self._floor, other._floor)
+            self._append(other._events)
+            await self._store.async_save(self._data_to_save())
+        await other.async_remove()
+
+    async def async_remove(self) -> None:
+        """Remove the history from disk."""
+        await self._store.async_remove()
+
@@ -0,0 +1,34 @@
+"""Request rate limiting for the Canterbury Bins integration."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` requests per second with bursts of ``burst``.
+
+    Callers queue on a lock, so tokens are handed out in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be made."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
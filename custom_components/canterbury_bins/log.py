@@ -0,0 +1,46 @@
+"""Low overhead logging helpers for the Canterbury Bins integration."""
+from __future__ import annotations
+
+import logging
+import reprlib
+from typing import Any
+
+from .const import LOG_SUMMARY_LENGTH, TRACE_LOGGER_NAME
+
+# Raw API responses are only logged here. The logger sits outside the
+# integration's logger hierarchy so turning on debug logging for the
+# integration does not also dump whole payloads; enable it explicitly with
+# ``canterbury_bins.trace: debug`` under ``logger:``.
+TRACE_LOGGER = logging.getLogger(TRACE_LOGGER_NAME)
+
+# Bounded repr, so summarising a large payload never formats all of it
+_REPR = reprlib.Repr()
+_REPR.maxlevel = 3
+_REPR.maxdict = 4
+_REPR.maxlist = 4
+_REPR.maxstring = LOG_SUMMARY_LENGTH
+_REPR.maxother = LOG_SUMMARY_LENGTH
+
+
+class Summary:
+    """Lazily formatted, truncated description of a payload.
+
+    Nothing is formatted unless a handler actually emits the record.
+    """
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value: Any) -> None:
+        """Initialize."""
+        self._value = value
+
+    def __str__(self) -> str:
+        """Return the summary."""
+        value = self._value
+        try:
+            size = f" of length {len(value)}"
+        except TypeError:
+            size = ""
+        return f"{type(value).__name__}{size}: {_REPR.repr(value)}"
+
+    __repr__ = __str__
@@ -0,0 +1,121 @@
+"""Refresh instrumentation for the Canterbury Bins integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable
+from contextlib import nullcontext
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+# Upper bounds of the timing histogram buckets in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in milliseconds."""
+
+    __slots__ = ("counts", "count", "total", "max", "last")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a duration."""
+        self.counts[bisect_left(BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        buckets = {f"<={bound}ms": n for bound, n in zip(BUCKETS_MS, self.counts)}
+        buckets[f">{BUCKETS_MS[-1]}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "max_ms": round(self.max, 3),
+            "last_ms": round(self.last, 3),
+            "buckets": buckets,
+        }
+
+
+class _StageTimer:
+    """Context manager recording the duration of a stage."""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        """Initialize."""
+        self._histogram = histogram
+
+    def __enter__(self) -> None:
+        """Start timing."""
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Record the elapsed time."""
+        self._histogram.observe((time.perf_counter() - self._start) * 1000)
+
+
+class RefreshMetrics:
+    """Counters and per-stage timings for one coordinator.
+
+    Counters are always kept. Stage timings are only taken when profiling
+    is enabled, otherwise ``timer`` hands back a shared no-op context
+    manager so disabled profiling costs nothing beyond the call.
+    """
+
+    def __init__(self, profiling: bool = False) -> None:
+        """Initialize."""
+        self.profiling = profiling
+        self.counters: Counter[str] = Counter()
+        self.histograms: dict[str, Histogram] = {}
+        self.payload_size: int | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    def timer(self, stage: str):
+        """Return a context manager timing a stage when profiling."""
+        if not self.profiling:
+            return _NULL_TIMER
+        if (histogram := self.histograms.get(stage)) is None:
+            histogram = self.histograms[stage] = Histogram()
+        return _StageTimer(histogram)
+
+    def increment(self, name: str) -> None:
+        """Increment a counter."""
+        self.counters[name] += 1
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for metric updates, returning a function to stop listening."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def async_notify(self) -> None:
+        """Tell listeners the metrics changed."""
+        for update_callback in self._listeners:
+            update_callback()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "profiling": self.profiling,
+            "counters": dict(self.counters),
+            "payload_size": self.payload_size,
+            "timings": {
+                stage: histogram.as_dict() for stage, histogram in self.histograms.items()
+            },
+        }
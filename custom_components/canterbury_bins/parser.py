@@ -0,0 +1,105 @@
+"""Response parser for the Canterbury Bins API.
+
+This module has no Home Assistant dependencies so it can be reused by the
+command line tools and benchmarked on its own.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterator
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from .const import BIN_TYPES, EVENT_TYPES
+
+# The dates and status sections are JSON documents embedded as strings
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def fingerprint(raw: str | bytes | None) -> bytes:
+    """Return a short digest of one of the embedded JSON strings."""
+    if raw is None:
+        return b""
+    if isinstance(raw, str):
+        raw = raw.encode()
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def decode_section(raw: str | bytes | None) -> dict[str, Any]:
+    """Decode one of the JSON strings embedded in the API response."""
+    if not raw:
+        return {}
+    return _loads(raw)
+
+
+def parse_dates(dates: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the sorted collection dates for each bin type."""
+    processed = {}
+    for bin_key in BIN_TYPES:
+        # Dates arrive in order, so this sort is a single linear pass
+        processed[bin_key] = {"dates": sorted(d[:10] for d in dates.get(bin_key) or ())}
+    return processed
+
+
+def parse_last_collections(status: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the most recent street status event for each bin type."""
+    newest: dict[str, dict[str, Any]] = {}
+    newest_dates: dict[str, str] = {}
+    for event in status.get("streetStatus") or ():
+        bin_key = EVENT_TYPES.get((event.get("type") or "").lower())
+        if bin_key is None:
+            continue
+        timestamp = event.get("date") or ""
+        if bin_key not in newest or timestamp > newest_dates[bin_key]:
+            newest[bin_key] = event
+            newest_dates[bin_key] = timestamp
+
+    last_collections = {}
+    for bin_key, event in newest.items():
+        timestamp = newest_dates[bin_key]
+        last_collections[bin_key] = {
+            "timestamp": timestamp,
+            "date": timestamp[:10],  # Keep date-only version for compatibility
+            "outcome": event.get("outcome", ""),
+            "workpack": event.get("workpack", ""),
+        }
+    return last_collections
+
+
+def iter_events(status: dict[str, Any]) -> Iterator[tuple[str, str, str, str]]:
+    """Yield (bin key, timestamp, outcome, workpack) for each street status event."""
+    for event in status.get("streetStatus") or ():
+        bin_key = EVENT_TYPES.get((event.get("type") or "").lower())
+        if bin_key is not None and (timestamp := event.get("date")):
+            yield bin_key, timestamp, event.get("outcome") or "", event.get("workpack") or ""
+
+
+def merge_sections(
+    dates: dict[str, dict[str, Any]], last_collections: dict[str, dict[str, Any]]
+) -> dict[str, dict[str, Any]]:
+    """Combine parsed dates and last collections without modifying either."""
+    return {
+        bin_key: {**bin_dates, "last_collection": last_collections[bin_key]}
+        if bin_key in last_collections
+        else bin_dates
+        for bin_key, bin_dates in dates.items()
+    }
+
+
+def parse_sections(
+    dates: dict[str, Any], status: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """Build the per-bin payload from the decoded dates and status sections."""
+    return merge_sections(parse_dates(dates), parse_last_collections(status))
+
+
+def parse_response(result: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Turn a raw API response into the per-bin payload used by the coordinator."""
+    return parse_sections(
+        decode_section(result.get("dates")), decode_section(result.get("status"))
+    )
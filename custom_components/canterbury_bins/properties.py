@@ -0,0 +1,119 @@
+"""Per-property state for the Canterbury Bins integration."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN, CONF_NAME, CONF_PROPERTIES, CONF_UPRN, CONF_USRN
+from .history import CollectionHistory
+from .metrics import RefreshMetrics
+from .parser import (
+    decode_section,
+    fingerprint,
+    iter_events,
+    merge_sections,
+    parse_dates,
+    parse_last_collections,
+)
+from .scheduler import roll_forward
+from .schedule import BinSchedule, build_schedules
+from .snapshot import BinSnapshot, build_snapshots
+
+
+def entry_properties(data: dict[str, Any]) -> list[dict[str, str]]:
+    """Return the properties configured in a config entry's data."""
+    if CONF_PROPERTIES in data:
+        return data[CONF_PROPERTIES]
+    return [{CONF_UPRN: data[CONF_UPRN], CONF_USRN: data[CONF_USRN]}]
+
+
+class PropertyState:
+    """Parsed data for one address served by a coordinator.
+
+    Keeps the fingerprint and parsed form of each section of the last
+    response, so a refresh only decodes and processes what changed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, config: dict[str, str]
+    ) -> None:
+        """Initialize."""
+        self.uprn: str = config[CONF_UPRN]
+        self.usrn: str = config[CONF_USRN]
+        self.name: str = config.get(CONF_NAME) or f"UPRN {self.uprn}"
+        self.history = CollectionHistory(hass, f"{entry_id}.{self.uprn}")
+        self.processed: dict[str, dict] | None = None
+        self.schedules: dict[str, BinSchedule] = {}
+        self.snapshots: dict[str, BinSnapshot] = {}
+        self.failures = 0
+        self._dates_fingerprint: bytes | None = None
+        self._dates: dict[str, dict] = {}
+        self._status_fingerprint: bytes | None = None
+        self._last_collections: dict[str, dict] = {}
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device grouping this property's entities."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.uprn)},
+            name=self.name,
+            manufacturer="Canterbury City Council",
+        )
+
+    def update(self, result: dict[str, Any], today: date, metrics: RefreshMetrics) -> bool:
+        """Apply an API response, returning whether anything changed."""
+        dates_raw = result.get("dates")
+        status_raw = result.get("status")
+        metrics.payload_size = (metrics.payload_size or 0) + len(dates_raw or "") + len(
+            status_raw or ""
+        )
+        dates_fingerprint = fingerprint(dates_raw)
+        status_fingerprint = fingerprint(status_raw)
+        dates_changed = dates_fingerprint != self._dates_fingerprint
+        status_changed = status_fingerprint != self._status_fingerprint
+
+        if not dates_changed and not status_changed and self.processed is not None:
+            metrics.increment("unchanged")
+            return False
+
+        # Only decode and process the sections that changed
+        with metrics.timer("decode"):
+            dates_section = decode_section(dates_raw) if dates_changed else None
+            status = decode_section(status_raw) if status_changed else None
+        with metrics.timer("process"):
+            dates = parse_dates(dates_section) if dates_changed else self._dates
+            last_collections = (
+                parse_last_collections(status) if status_changed else self._last_collections
+            )
+            processed = roll_forward(merge_sections(dates, last_collections), today)
+            snapshots = build_snapshots(processed, today)
+            schedules = (
+                build_schedules(processed)
+                if dates_changed or not self.schedules
+                else self.schedules
+            )
+
+        if status_changed:
+            self.history.async_merge(iter_events(status))
+        self._dates, self._dates_fingerprint = dates, dates_fingerprint
+        self._last_collections, self._status_fingerprint = last_collections, status_fingerprint
+        self.processed = processed
+        self.snapshots = snapshots
+        self.schedules = schedules
+        return True
+
+    def restore(self, processed: dict[str, dict], today: date) -> None:
+        """Restore the processed payload from the on-disk cache."""
+        self.processed = roll_forward(processed, today)
+        self.schedules = build_schedules(self.processed)
+        self.snapshots = build_snapshots(self.processed, today)
+
+    def roll_forward(self, today: date) -> None:
+        """Advance each bin to its next future date."""
+        if self.processed is None:
+            return
+        self.processed = roll_forward(self.processed, today)
+        self.snapshots = build_snapshots(self.processed, today)
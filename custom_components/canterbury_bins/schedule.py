@@ -0,0 +1,58 @@
+"""Collection schedule index for the Canterbury Bins integration."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+
+class BinSchedule:
+    """Sorted collection days for one bin, stored as ordinals.
+
+    Lookups bisect the ordinal array, so finding the next collection or the
+    collections in a date range is O(log n) with no per-date objects kept
+    in memory.
+    """
+
+    __slots__ = ("_days",)
+
+    def __init__(self, dates: Iterable[str]) -> None:
+        """Initialize from ISO formatted dates."""
+        self._days = array("i", sorted(date.fromisoformat(d).toordinal() for d in dates))
+
+    def __len__(self) -> int:
+        """Return the number of collections."""
+        return len(self._days)
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether two schedules hold the same collection days."""
+        if not isinstance(other, BinSchedule):
+            return NotImplemented
+        return self._days == other._days
+
+    def __iter__(self) -> Iterator[date]:
+        """Return the collections in date order."""
+        return map(date.fromordinal, self._days)
+
+    def next_on_or_after(self, day: date) -> date | None:
+        """Return the first collection on or after a day."""
+        index = bisect_left(self._days, day.toordinal())
+        if index == len(self._days):
+            return None
+        return date.fromordinal(self._days[index])
+
+    def between(self, start: date, end: date) -> list[date]:
+        """Return the collections from start to end inclusive."""
+        days = self._days
+        return [
+            date.fromordinal(day)
+            for day in days[
+                bisect_left(days, start.toordinal()) : bisect_right(days, end.toordinal())
+            ]
+        ]
+
+
+def build_schedules(data: dict[str, dict]) -> dict[str, BinSchedule]:
+    """Build the schedule index for every bin in a processed payload."""
+    return {bin_key: BinSchedule(bin_data.get("dates", ())) for bin_key, bin_data in data.items()}
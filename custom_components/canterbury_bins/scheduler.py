@@ -0,0 +1,122 @@
+"""Refresh scheduling for the Canterbury Bins integration."""
+from __future__ import annotations
+
+import zlib
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from .const import (
+    COLLECTION_DAY_START,
+    COLLECTION_DAY_END,
+    STAGGER_FRACTION,
+    STAGGER_WINDOW,
+)
+
+
+def _parse_date(value: str | None) -> date | None:
+    """Parse the date portion of an API date or timestamp."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def next_refresh_interval(
+    data: dict[str, Any] | None,
+    now: datetime,
+    min_interval: timedelta,
+    max_interval: timedelta,
+) -> timedelta:
+    """Return how long to wait before polling the API again.
+
+    Polls every ``min_interval`` while crews are out on a collection day, or
+    when a collection outcome has been reported today, so outcomes show up
+    quickly. Otherwise sleeps until crews start on the next collection day,
+    bounded by ``min_interval`` and ``max_interval`` so schedule changes are
+    still picked up.
+    """
+    if not data:
+        return min_interval
+
+    today = now.date()
+    next_dates = []
+    for bin_data in data.values():
+        if (next_date := _parse_date(bin_data.get("next_date"))) is not None:
+            next_dates.append(next_date)
+        last_collection = bin_data.get("last_collection") or {}
+        if _parse_date(last_collection.get("date")) == today:
+            # Outcomes are landing, keep an eye on the other bins
+            if COLLECTION_DAY_START <= now.time() < COLLECTION_DAY_END:
+                return min_interval
+
+    upcoming = [d for d in next_dates if d >= today]
+    if not upcoming:
+        return max_interval
+
+    next_date = min(upcoming)
+    crews_out = datetime.combine(next_date, COLLECTION_DAY_START, now.tzinfo)
+    crews_back = datetime.combine(next_date, COLLECTION_DAY_END, now.tzinfo)
+
+    if crews_out <= now < crews_back:
+        return min_interval
+    if now >= crews_back:
+        # Collection day is over, the schedule will move on overnight
+        return max_interval
+
+    return max(min_interval, min(max_interval, crews_out - now))
+
+
+def staggered_interval(
+    interval: timedelta,
+    key: str,
+    now: datetime,
+    min_interval: timedelta,
+    max_interval: timedelta,
+) -> timedelta:
+    """Nudge an interval so the refresh lands in this entry's phase slot.
+
+    Every entry gets a deterministic phase derived from ``key`` on a grid
+    whose spacing is a small fraction of ``interval`` (at most
+    ``STAGGER_WINDOW``, and never more than the gap between the limits),
+    and refreshes snap to the nearest slot on that grid. A slot beyond
+    ``max_interval`` or short of ``min_interval`` is swapped for the
+    neighbouring slot, so entries keep their phase and stay spread out
+    instead of piling up on a limit.
+    """
+    window = min(
+        interval * STAGGER_FRACTION,
+        timedelta(minutes=STAGGER_WINDOW),
+        max_interval - min_interval,
+    ).total_seconds()
+    if window <= 0:
+        return interval
+    phase = window * zlib.crc32(key.encode()) / 2**32
+    start = now.timestamp()
+    slot = round((start + interval.total_seconds() - phase) / window) * window + phase
+    if slot - start > max_interval.total_seconds():
+        slot -= window
+    elif slot - start < min_interval.total_seconds():
+        slot += window
+    return timedelta(seconds=slot - start)
+
+
+def roll_forward(data: dict[str, Any], today: date) -> dict[str, Any]:
+    """Return the data with each bin's next date picked from its full schedule.
+
+    Dates that have already gone are skipped, so this can run locally at
+    midnight to move sensors on without fetching from the API again.
+    """
+    today_str = today.isoformat()
+    rolled = {}
+    for bin_key, bin_data in data.items():
+        dates = bin_data.get("dates", [])
+        index = bisect_left(dates, today_str)
+        rolled[bin_key] = {
+            **bin_data,
+            "next_date": dates[index] if index < len(dates) else None,
+            "future_dates": max(len(dates) - index - 1, 0),
+        }
+    return rolled
@@ -2,171 +2,198 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from typing import Any
+from collections.abc import Callable
+from datetime import date, datetime
+from typing import Any, Mapping
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, BIN_TYPES
+from .metrics import RefreshMetrics
+from .properties import PropertyState
+from .snapshot import BinSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
+def _failures(metrics: RefreshMetrics) -> int:
+    """Return the number of failed refreshes."""
+    return sum(n for name, n in metrics.counters.items() if name.startswith("failures."))
+
+def _refresh_duration(metrics: RefreshMetrics) -> float | None:
+    """Return the duration of the last refresh when profiling."""
+    if (histogram := metrics.histograms.get("refresh")) is None:
+        return None
+    return round(histogram.last, 3)
+
+# key, name, unit, value function
+DIAGNOSTIC_SENSORS: tuple[tuple[str, str, str | None, Callable[[RefreshMetrics], Any]], ...] = (
+    ("payload_size", "Last Payload Size", UnitOfInformation.BYTES, lambda m: m.payload_size),
+    ("refreshes", "Refreshes", None, lambda m: m.counters["refreshes"]),
+    ("failures", "Refresh Failures", None, _failures),
+    ("refresh_duration", "Last Refresh Duration", UnitOfTime.MILLISECONDS, _refresh_duration),
+)
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Canterbury Bins sensors."""
-    _LOGGER.debug("Setting up Canterbury Bins sensors")
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    
-    if not coordinator.data:
-        _LOGGER.warning("No data available from coordinator")
-        return
 
-    _LOGGER.debug("Coordinator data: %s", coordinator.data)
-    
     sensors = []
-    for bin_key, bin_name in BIN_TYPES.items():
-        # Create next collection sensor
-        sensors.append(CanterburyBinsNextSensor(coordinator, bin_key, bin_name))
-        # Create last collection sensor
-        sensors.append(CanterburyBinsLastSensor(coordinator, bin_key, bin_name))
+    for prop in coordinator.properties.values():
+        for bin_key, bin_name in BIN_TYPES.items():
+            # Create next collection sensor
+            sensors.append(CanterburyBinsNextSensor(coordinator, prop, bin_key, bin_name))
+            # Create last collection sensor
+            sensors.append(CanterburyBinsLastSensor(coordinator, prop, bin_key, bin_name))
+    # Create diagnostic sensors, disabled until enabled in the entity registry
+    for key, name, unit, value_fn in DIAGNOSTIC_SENSORS:
+        sensors.append(
+            CanterburyBinsDiagnosticSensor(coordinator, entry, key, name, unit, value_fn)
+        )
     
-    _LOGGER.debug("Created %d sensors: %s", len(sensors), [s._attr_name for s in sensors])
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Created %d sensors for UPRNs %s", len(sensors), ", ".join(coordinator.properties)
+        )
     async_add_entities(sensors)
 
-class CanterburyBinsNextSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Canterbury Bins next collection sensor."""
+class CanterburyBinsSensor(CoordinatorEntity, SensorEntity):
+    """Base class for Canterbury Bins sensors backed by a bin snapshot."""
 
-    def __init__(self, coordinator, bin_key: str, bin_name: str) -> None:
+    def __init__(self, coordinator, prop: PropertyState, bin_key: str) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
+        self._uprn = prop.uprn
         self._bin_key = bin_key
-        self._attr_name = f"Next {bin_name} Collection"
-        self._attr_unique_id = f"canterbury_bins_next_{bin_key}"
+        self._attr_device_info = prop.device_info
+        # Tell properties apart by name when an entry serves more than one
+        self._prefix = f"{prop.name} " if len(coordinator.properties) > 1 else ""
         self._attr_icon = "mdi:delete-empty" if bin_key == "blackBinDay" else "mdi:recycle"
-        _LOGGER.debug("Initialized next collection sensor: %s (key: %s)", self._attr_name, bin_key)
+        self._written: tuple[BinSnapshot | None, bool] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written = (self._snapshot, self.available)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this bin's snapshot or availability changed."""
+        current = (self._snapshot, self.available)
+        if current == self._written:
+            return
+        self._written = current
+        with self.coordinator.metrics.timer("state_write"):
+            self.async_write_ha_state()
 
     @property
-    def native_value(self) -> str:
-        """Return the state of the sensor."""
+    def _snapshot(self) -> BinSnapshot | None:
+        """Return the coordinator's snapshot for this property's bin."""
         if not self.coordinator.data:
-            _LOGGER.debug("No coordinator data available for %s", self._attr_name)
             return None
+        return self.coordinator.data.get(self._uprn, {}).get(self._bin_key)
 
-        bin_data = self.coordinator.data.get(self._bin_key, {})
-        next_date = bin_data.get("next_date")
-        
-        if not next_date:
-            _LOGGER.debug("No next date available for %s", self._attr_name)
-            return None
+class CanterburyBinsNextSensor(CanterburyBinsSensor):
+    """Representation of a Canterbury Bins next collection sensor."""
+
+    _attr_device_class = SensorDeviceClass.DATE
+
+    def __init__(
+        self, coordinator, prop: PropertyState, bin_key: str, bin_name: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, prop, bin_key)
+        self._attr_name = f"{self._prefix}Next {bin_name} Collection"
+        self._attr_unique_id = f"canterbury_bins_{prop.uprn}_next_{bin_key}"
 
-        try:
-            # Add time component for midnight
-            timestamp = f"{next_date}T00:00:00"
-            _LOGGER.debug("Sensor %s value: %s", self._attr_name, timestamp)
-            return timestamp
-        except ValueError as err:
-            _LOGGER.error("Error parsing date for %s: %s", self._attr_name, err)
+    @property
+    def native_value(self) -> date | None:
+        """Return the state of the sensor."""
+        if (snapshot := self._snapshot) is None:
             return None
+        return snapshot.next_date
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return the state attributes."""
-        if not self.coordinator.data:
-            _LOGGER.debug("No coordinator data available for %s attributes", self._attr_name)
+        if (snapshot := self._snapshot) is None:
             return {}
+        return snapshot.next_attributes
 
-        bin_data = self.coordinator.data.get(self._bin_key, {})
-        next_date = bin_data.get("next_date")
-        future_dates = bin_data.get("future_dates", 0)
-        
-        attributes = {
-            "future_collections": future_dates
-        }
-
-        if not next_date:
-            return attributes
-
-        try:
-            date = datetime.strptime(next_date, "%Y-%m-%d")
-            days_until = (date - datetime.now()).days
-            attributes.update({
-                "days_until": days_until,
-                "collection_date": date.strftime("%A, %d %B %Y")
-            })
-        except ValueError as err:
-            _LOGGER.error("Error calculating days until for %s: %s", self._attr_name, err)
-
-        return attributes
-
-class CanterburyBinsLastSensor(CoordinatorEntity, SensorEntity):
+class CanterburyBinsLastSensor(CanterburyBinsSensor):
     """Representation of a Canterbury Bins last collection sensor."""
 
-    def __init__(self, coordinator, bin_key: str, bin_name: str) -> None:
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(
+        self, coordinator, prop: PropertyState, bin_key: str, bin_name: str
+    ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._bin_key = bin_key
-        self._attr_name = f"Last {bin_name} Collection"
-        self._attr_unique_id = f"canterbury_bins_last_{bin_key}"
-        self._attr_icon = "mdi:delete-empty" if bin_key == "blackBinDay" else "mdi:recycle"
-        _LOGGER.debug("Initialized last collection sensor: %s (key: %s)", self._attr_name, bin_key)
+        super().__init__(coordinator, prop, bin_key)
+        self._attr_name = f"{self._prefix}Last {bin_name} Collection"
+        self._attr_unique_id = f"canterbury_bins_{prop.uprn}_last_{bin_key}"
 
     @property
-    def native_value(self) -> str:
+    def native_value(self) -> datetime | None:
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            _LOGGER.debug("No coordinator data available for %s", self._attr_name)
-            return None
-
-        bin_data = self.coordinator.data.get(self._bin_key, {})
-        last_collection = bin_data.get("last_collection", {})
-        
-        if not last_collection:
-            _LOGGER.debug("No last collection available for %s", self._attr_name)
-            return None
-
-        timestamp = last_collection.get("timestamp")
-        if not timestamp:
+        if (snapshot := self._snapshot) is None:
             return None
-
-        _LOGGER.debug("Sensor %s value: %s", self._attr_name, timestamp)
-        return timestamp
+        return snapshot.last_collected
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return the state attributes."""
-        if not self.coordinator.data:
-            _LOGGER.debug("No coordinator data available for %s attributes", self._attr_name)
-            return {}
-
-        bin_data = self.coordinator.data.get(self._bin_key, {})
-        last_collection = bin_data.get("last_collection", {})
-        
-        if not last_collection:
+        if (snapshot := self._snapshot) is None:
             return {}
+        return snapshot.last_attributes
+
+class CanterburyBinsDiagnosticSensor(SensorEntity):
+    """Representation of a Canterbury Bins refresh metric."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator,
+        entry: ConfigEntry,
+        key: str,
+        name: str,
+        unit: str | None,
+        value_fn: Callable[[RefreshMetrics], Any],
+    ) -> None:
+        """Initialize the sensor."""
+        self._metrics: RefreshMetrics = coordinator.metrics
+        self._value_fn = value_fn
+        self._attr_name = name
+        self._attr_unique_id = f"canterbury_bins_{entry.entry_id}_{key}"
+        # Metrics belong to the entry, so group them on a device named after it
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = (
+            SensorStateClass.TOTAL_INCREASING if unit is None else SensorStateClass.MEASUREMENT
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever the coordinator records new metrics."""
+        self.async_on_remove(self._metrics.async_add_listener(self.async_write_ha_state))
 
-        timestamp = last_collection.get("timestamp")
-        try:
-            # Try to parse the timestamp to format it nicely
-            dt = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f")
-            formatted_time = dt.strftime("%H:%M")
-        except ValueError:
-            try:
-                # Try without milliseconds
-                dt = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S")
-                formatted_time = dt.strftime("%H:%M")
-            except ValueError:
-                formatted_time = "00:00"  # Fallback for midnight timestamps
-
-        return {
-            "collection_time": formatted_time,
-            "collection_date": last_collection.get("date"),
-            "outcome": last_collection.get("outcome"),
-            "workpack": last_collection.get("workpack")
-        } 
\ No newline at end of file
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        return self._value_fn(self._metrics)
@@ -0,0 +1,61 @@
+"""Services for the Canterbury Bins integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, ATTR_WEEKS, DEFAULT_HISTORY_WEEKS, SERVICE_GET_COLLECTION_HISTORY
+
+GET_COLLECTION_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_WEEKS, default=DEFAULT_HISTORY_WEEKS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=520)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Canterbury Bins services."""
+
+    async def async_get_collection_history(call: ServiceCall) -> ServiceResponse:
+        """Return collection outcomes and miss rates per bin."""
+        coordinators = hass.data.get(DOMAIN, {})
+        if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is not None:
+            if entry_id not in coordinators:
+                raise ServiceValidationError(f"No Canterbury Bins entry {entry_id}")
+            coordinators = {entry_id: coordinators[entry_id]}
+
+        since = dt_util.now() - timedelta(weeks=call.data[ATTR_WEEKS])
+        return {
+            "weeks": call.data[ATTR_WEEKS],
+            "entries": {
+                entry_id: {
+                    "properties": {
+                        uprn: {
+                            "name": prop.name,
+                            "events": len(prop.history),
+                            "bins": prop.history.summary(since),
+                        }
+                        for uprn, prop in coordinator.properties.items()
+                    }
+                }
+                for entry_id, coordinator in coordinators.items()
+            },
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_COLLECTION_HISTORY,
+        async_get_collection_history,
+        schema=GET_COLLECTION_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,74 @@
+"""Precomputed entity state for the Canterbury Bins integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from homeassistant.util import dt as dt_util
+
+from .const import API_TIME_ZONE
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class BinSnapshot:
+    """Parsed state for one bin type, built once per refresh."""
+
+    next_date: date | None
+    next_attributes: Mapping[str, Any]
+    last_collected: datetime | None
+    last_attributes: Mapping[str, Any]
+
+
+def _parse_timestamp(timestamp: str | None) -> datetime | None:
+    """Parse a street status timestamp, assuming council local time."""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.get_time_zone(API_TIME_ZONE))
+    return parsed
+
+
+def build_snapshot(bin_data: dict[str, Any], today: date) -> BinSnapshot:
+    """Build the snapshot for one bin from its processed payload."""
+    next_date = None
+    next_attributes = {"future_collections": bin_data.get("future_dates", 0)}
+    if next_date_str := bin_data.get("next_date"):
+        next_date = date.fromisoformat(next_date_str)
+        next_attributes["days_until"] = (next_date - today).days
+        next_attributes["collection_date"] = next_date.strftime("%A, %d %B %Y")
+
+    last_collected = None
+    last_attributes = _EMPTY
+    if last_collection := bin_data.get("last_collection"):
+        last_collected = _parse_timestamp(last_collection.get("timestamp"))
+        last_attributes = MappingProxyType(
+            {
+                # Midnight timestamps are reported without a time
+                "collection_time": last_collected.strftime("%H:%M")
+                if last_collected
+                else "00:00",
+                "collection_date": last_collection.get("date"),
+                "outcome": last_collection.get("outcome"),
+                "workpack": last_collection.get("workpack"),
+            }
+        )
+
+    return BinSnapshot(
+        next_date=next_date,
+        next_attributes=MappingProxyType(next_attributes),
+        last_collected=last_collected,
+        last_attributes=last_attributes,
+    )
+
+
+def build_snapshots(data: dict[str, Any], today: date) -> dict[str, BinSnapshot]:
+    """Build the snapshots for every bin in a processed payload."""
+    return {bin_key: build_snapshot(bin_data, today) for bin_key, bin_data in data.items()}
@@ -0,0 +1,73 @@
+"""Persistent response cache for the Canterbury Bins integration."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, CACHE_VERSION, CACHE_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _CacheStore(Store):
+    """Store that discards caches written with an older schema."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict
+    ) -> dict:
+        """Drop the cached payload instead of migrating it."""
+        _LOGGER.debug(
+            "Discarding %s cache with schema version %s", self.key, old_major_version
+        )
+        return {}
+
+
+class CanterburyBinsCache:
+    """Last good processed payload for a config entry, persisted to disk."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store = _CacheStore(hass, CACHE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._pending: dict[str, Any] | None = None
+
+    async def async_load(self) -> tuple[datetime, dict[str, Any], datetime] | None:
+        """Return the cached payload, when it was fetched and when its schedule last changed."""
+        stored = await self._store.async_load()
+        if not stored or "data" not in stored:
+            return None
+        if (fetched_at := dt_util.parse_datetime(stored.get("fetched_at", ""))) is None:
+            return None
+        changed_at = dt_util.parse_datetime(stored.get("changed_at") or "") or fetched_at
+        return fetched_at, stored["data"], changed_at
+
+    def async_save(self, data: dict[str, Any], changed_at: datetime | None = None) -> None:
+        """Schedule the payload to be written to disk."""
+        self._pending = {
+            "fetched_at": dt_util.utcnow().isoformat(),
+            "changed_at": changed_at.isoformat() if changed_at else None,
+            "data": data,
+        }
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any] | None:
+        """Hand the pending payload to the store."""
+        payload, self._pending = self._pending, None
+        return payload
+
+    async def async_flush(self) -> None:
+        """Write a pending payload now instead of after the save delay.
+
+        The store's delayed write is cancelled, so it cannot recreate the
+        file after the entry has been removed.
+        """
+        if self._pending is not None:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the cache from disk."""
+        await self._store.async_remove()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Drive many Canterbury Bins coordinators against the local mock API."""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import aiohttp
+
+from mock_api import add_server_arguments, server_from_arguments
+
+
+def percentile(values, fraction):
+    """Return the value at a fraction of the sorted values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args: argparse.Namespace):
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.canterbury_bins import CanterburyBinsCoordinator
+    from custom_components.canterbury_bins.api import CanterburyBinsApi
+    from custom_components.canterbury_bins.const import (
+        CONF_PROPERTIES,
+        CONF_UPRN,
+        CONF_USRN,
+        DATA_API,
+    )
+
+    server = server_from_arguments(args)
+    url = await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        session = aiohttp.ClientSession()
+        hass.data[DATA_API] = CanterburyBinsApi(
+            hass,
+            session=session,
+            url=url,
+            freshness=args.freshness,
+            rate_limit=args.rate_limit,
+            max_connections=args.max_connections,
+        )
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        coordinators = [
+            CanterburyBinsCoordinator(
+                hass,
+                SimpleNamespace(
+                    entry_id=f"load_test_{index}",
+                    data={
+                        CONF_PROPERTIES: [
+                            {
+                                CONF_UPRN: str(100000000 + number),
+                                CONF_USRN: str(200000 + number % args.streets),
+                            }
+                            for number in range(
+                                index * args.properties, (index + 1) * args.properties
+                            )
+                        ]
+                    },
+                    options={},
+                ),
+            )
+            for index in range(args.entries)
+        ]
+
+        latencies = []
+        failures = 0
+
+        async def refresh(coordinator):
+            nonlocal failures
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append(time.perf_counter() - start)
+            if not coordinator.last_update_success:
+                failures += 1
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(refresh(c) for c in coordinators))
+        elapsed = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        for coordinator in coordinators:
+            await coordinator.async_unload()
+        await session.close()
+        await hass.async_stop(force=True)
+
+    await server.stop()
+
+    refreshes = len(latencies)
+    print(
+        f"Entries:            {args.entries} x {args.properties} properties "
+        f"on {args.streets} streets"
+    )
+    print(f"Refreshes:          {refreshes} ({failures} failed)")
+    print(f"Upstream calls:     {server.calls} ({server.errors} errors)")
+    print(f"Refreshes/sec:      {refreshes / elapsed:.1f}")
+    print(f"Upstream calls/sec: {server.calls / elapsed:.1f}")
+    print(f"Refresh p50:        {percentile(latencies, 0.5) * 1000:.1f} ms")
+    print(f"Refresh p99:        {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"Refresh mean:       {statistics.fmean(latencies) * 1000:.1f} ms")
+    print(f"Memory per entry:   {memory / args.entries / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100, help="coordinators to run")
+    parser.add_argument("--properties", type=int, default=1, help="properties per entry")
+    parser.add_argument("--streets", type=int, default=20, help="distinct USRNs")
+    parser.add_argument("--rounds", type=int, default=3, help="refreshes per coordinator")
+    parser.add_argument(
+        "--freshness",
+        type=float,
+        default=0,
+        help="seconds responses are reused, 0 sends every refresh upstream",
+    )
+    parser.add_argument("--rate-limit", type=float, default=1000.0, help="requests per second")
+    parser.add_argument("--max-connections", type=int, default=4, help="concurrent requests")
+    add_server_arguments(parser)
+    asyncio.run(run(parser.parse_args()))
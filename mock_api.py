@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Canterbury Bins get-bin-dates endpoint."""
+import argparse
+import asyncio
+import json
+import random
+import zlib
+
+from aiohttp import web
+
+from script_support import make_response
+
+
+class MockApiServer:
+    """Serve synthetic bin dates with configurable latency and errors."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        events: int = 50,
+        dates_per_bin: int = 26,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.events = events
+        self.dates_per_bin = dates_per_bin
+        self.calls = 0
+        self.errors = 0
+        self._bodies = {}
+        self._runner = None
+        self._rng = random.Random(0)
+
+    def _body(self, uprn: str, usrn: str) -> bytes:
+        """Return the response body for a property, generating it once."""
+        if (body := self._bodies.get((uprn, usrn))) is None:
+            # Properties on the same street share their street status
+            response = make_response(
+                self.events, self.dates_per_bin, seed=zlib.crc32(usrn.encode())
+            )
+            body = self._bodies[(uprn, usrn)] = json.dumps(response).encode()
+        return body
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Handle a get-bin-dates request."""
+        self.calls += 1
+        data = await request.json()
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=self.error_status, text="Service Unavailable")
+        return web.Response(
+            body=self._body(str(data.get("uprn")), str(data.get("usrn"))),
+            content_type="application/json",
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the endpoint URL."""
+        app = web.Application()
+        app.router.add_post("/Beta/get-bin-dates", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}/Beta/get-bin-dates"
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Add the mock server options to an argument parser."""
+    parser.add_argument("--latency", type=float, default=0.05, help="response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="status code for failures")
+    parser.add_argument("--events", type=int, default=50, help="streetStatus events per response")
+    parser.add_argument("--dates-per-bin", type=int, default=26, help="collection dates per bin")
+
+
+def server_from_arguments(args: argparse.Namespace) -> MockApiServer:
+    """Create a mock server from parsed arguments."""
+    return MockApiServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        events=args.events,
+        dates_per_bin=args.dates_per_bin,
+    )
+
+
+async def serve(args: argparse.Namespace):
+    server = server_from_arguments(args)
+    url = await server.start(args.host, args.port)
+    print(f"Mock API listening on {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(f"Served {server.calls} requests ({server.errors} errors)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_server_arguments(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
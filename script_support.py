@@ -0,0 +1,49 @@
+"""Helpers shared by the Canterbury Bins command line tools."""
+import importlib
+import json
+import random
+import sys
+import types
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).parent / "custom_components" / "canterbury_bins"
+
+
+def load_parser():
+    """Import the parser without importing Home Assistant."""
+    package = types.ModuleType("canterbury_bins")
+    package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules.setdefault("canterbury_bins", package)
+    return importlib.import_module("canterbury_bins.parser")
+
+
+def make_response(events: int, dates_per_bin: int = 26, seed: int = 0) -> dict:
+    """Build a response in the API's double-encoded format."""
+    rng = random.Random(seed)
+    start = date.today()
+    dates = {
+        bin_key: [
+            f"{start + timedelta(days=7 * week + offset)}T00:00:00"
+            for week in range(dates_per_bin)
+        ]
+        for offset, bin_key in enumerate(
+            ("blackBinDay", "recyclingBinDay", "gardenBinDay", "foodBinDay")
+        )
+    }
+    now = datetime.now()
+    street_status = [
+        {
+            "type": rng.choice(("General", "Recycling", "Garden", "Food")),
+            "date": (now - timedelta(minutes=rng.randrange(525600))).isoformat(
+                timespec="milliseconds"
+            ),
+            "outcome": rng.choice(("Completed", "Not Collected", "Delayed")),
+            "workpack": f"WP{rng.randrange(10000):05d}",
+        }
+        for _ in range(events)
+    ]
+    return {
+        "dates": json.dumps(dates),
+        "status": json.dumps({"streetStatus": street_status}),
+    }